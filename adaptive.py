@@ -0,0 +1,368 @@
+from fractions import Fraction
+from math import gcd, lcm, prod, sqrt
+import numpy as np
+
+eps = np.finfo(float).eps
+
+
+def certifiedSign(terms, coeffs, ops):
+    # the sign of sum(terms(*coeffs)): in floats when the sum is larger
+    # than its rounding error bound, exactly in Fractions otherwise
+    floats = terms(*coeffs)
+    value = sum(floats)
+    bound = ops * eps * sum(abs(t) for t in floats)
+    if abs(value) <= bound:
+        value = sum(terms(*[Fraction(x) for x in coeffs]))
+    return int(value > 0) - int(value < 0)
+
+
+def certifiedZero(terms, coeffs, ops):
+    return certifiedSign(terms, coeffs, ops) == 0
+
+
+def exactDet(mtrx):
+    mtrx = [[Fraction(x) for x in row] for row in mtrx]
+    n = len(mtrx)
+    det = Fraction(1)
+    for col in range(n):
+        pivot = next((row for row in range(col, n) if mtrx[row][col] != 0), None)
+        if pivot is None:
+            return Fraction(0)
+        if pivot != col:
+            mtrx[col], mtrx[pivot] = mtrx[pivot], mtrx[col]
+            det = -det
+        det *= mtrx[col][col]
+        for row in range(col + 1, n):
+            factor = mtrx[row][col] / mtrx[col][col]
+            if factor:
+                for k in range(col, n):
+                    mtrx[row][k] -= factor * mtrx[col][k]
+    return det
+
+
+def filteredDet(mtrx):
+    # LU determinant, redone exactly when it is small against the Hadamard
+    # bound on |det|. The threshold leaves out LU pivot growth, so it is a
+    # heuristic filter rather than a certified error bound
+    n = len(mtrx)
+    if n == 0:
+        return 1.0
+    value = np.linalg.det(np.array(mtrx, dtype=float))
+    hadamard = prod(sqrt(sum(x*x for x in row)) for row in mtrx)
+    if abs(value) > 2 * n * n * eps * hadamard:
+        return value
+    return float(exactDet(mtrx))
+
+
+def stripZeros(coeffs):
+    coeffs = list(coeffs)
+    while len(coeffs) > 1 and coeffs[-1] == 0:
+        del coeffs[-1]
+    return coeffs
+
+
+def divideFloat(num, den):
+    m = len(den) - 1
+    rem = [float(x) for x in num]
+    quot = [0.0] * max(len(num) - m, 1)
+    for k in range(len(num) - 1 - m, -1, -1):
+        q = rem[m + k] / den[m]
+        quot[k] = q
+        for j in range(m + 1):
+            rem[j + k] -= q * den[j]
+    return quot, rem[:m]
+
+
+def remainderBound(num, quot, den, err_num=0.0, err_den=0.0):
+    # bound on the error in every coefficient of the remainder from
+    # divideFloat(num, den), given uniform bounds on the errors already
+    # carried by num and den. Each elimination step takes q from an entry
+    # known to within err, so q itself is off by about err/|lead| and that
+    # error is spread over the remainder through q * den
+    lead = abs(den[-1])
+    size = max(abs(x) for x in den)
+    work = max(abs(x) for x in num) + sum(abs(q) for q in quot) * size
+    err = err_num
+    for q in quot:
+        q_err = (err + abs(q) * err_den) / lead + eps * abs(q)
+        err += q_err * size + abs(q) * err_den + 2 * eps * (work + abs(q) * size)
+    return err
+
+
+def remainderExact(num, den):
+    m = len(den) - 1
+    rem = list(num)
+    for k in range(len(num) - 1 - m, -1, -1):
+        q = rem[m + k] / den[m]
+        for j in range(m + 1):
+            rem[j + k] -= q * den[j]
+    return stripZeros(rem[:m] or [Fraction(0)])
+
+
+def gcdFraction(first, second):
+    # monic gcd of two Fraction coefficient lists
+    first = stripZeros(first)
+    second = stripZeros(second)
+    while any(second):
+        lead = second[-1]
+        second = [x / lead for x in second]
+        first, second = second, remainderExact(first, second)
+    lead = first[-1]
+    return [x / lead for x in first]
+
+
+def exactGcd(first, second):
+    return [float(x) for x in gcdFraction([Fraction(x) for x in first], [Fraction(x) for x in second])]
+
+
+def quotientExact(num, den):
+    m = len(den) - 1
+    rem = list(num)
+    quot = [Fraction(0)] * max(len(num) - m, 1)
+    for k in range(len(num) - 1 - m, -1, -1):
+        q = rem[m + k] / den[m]
+        quot[k] = q
+        for j in range(m + 1):
+            rem[j + k] -= q * den[j]
+    return quot
+
+
+def diffExact(coeffs):
+    return [i * c for i, c in enumerate(coeffs)][1:] or [Fraction(0)]
+
+
+def subtractExact(first, second):
+    size = max(len(first), len(second))
+    first = first + [Fraction(0)] * (size - len(first))
+    second = second + [Fraction(0)] * (size - len(second))
+    return stripZeros([x - y for x, y in zip(first, second)])
+
+
+def integerCoeffs(coeffs):
+    # a positive integer multiple of coeffs, made primitive
+    fractions = [Fraction(x) for x in coeffs]
+    den = lcm(*(x.denominator for x in fractions))
+    return primitivePart(stripZeros([int(x * den) for x in fractions]))
+
+
+def primitivePart(coeffs):
+    content = gcd(*coeffs)
+    if content > 1:
+        return [x // content for x in coeffs]
+    return coeffs
+
+
+def pseudoRemainder(num, den):
+    # |lead(den)|^k times the remainder of num by den, so that the sign of
+    # the remainder is kept while every step stays in integers
+    m = len(den) - 1
+    lead = abs(den[-1])
+    sign = 1 if den[-1] > 0 else -1
+    rem = list(num)
+    for k in range(len(num) - 1 - m, -1, -1):
+        top = sign * rem[m + k]
+        rem = [x * lead for x in rem]
+        for j in range(m + 1):
+            rem[j + k] -= top * den[j]
+    return stripZeros(rem[:m] or [0])
+
+
+def quotientInteger(num, den):
+    # num divided by a primitive den that divides it; by Gauss's lemma the
+    # quotient has integer coefficients, so every step divides exactly
+    m = len(den) - 1
+    rem = list(num)
+    quot = [0] * max(len(num) - m, 1)
+    for k in range(len(num) - 1 - m, -1, -1):
+        q = rem[m + k] // den[m]
+        quot[k] = q
+        for j in range(m + 1):
+            rem[j + k] -= q * den[j]
+    return quot
+
+
+def sturmChainIntegers(coeffs):
+    # the Sturm chain as a primitive remainder sequence over the integers,
+    # each member a positive multiple of the Fraction remainder, so the
+    # coefficients grow far more slowly; any repeated factor is divided out
+    chain = [integerCoeffs(coeffs)]
+    chain.append(primitivePart([i * c for i, c in enumerate(chain[0])][1:] or [0]))
+    while len(chain[-1]) > 1:
+        remainder = pseudoRemainder(chain[-2], chain[-1])
+        if not any(remainder):
+            break
+        chain.append(primitivePart([-x for x in remainder]))
+
+    if len(chain[-1]) > 1:
+        common = chain[-1]
+        chain = [quotientInteger(member, common) for member in chain]
+    return chain
+
+
+def scaledFloats(coeffs):
+    # integer coefficients over a power of two, to about unit size; the
+    # float conversion of a primitive multiple of float input stays exact
+    size = 1 << max(abs(x) for x in coeffs).bit_length()
+    return [x / size for x in coeffs]
+
+
+def sturmChainExact(coeffs):
+    return [scaledFloats(member) for member in sturmChainIntegers(coeffs)]
+
+
+def signExact(coeffs, x):
+    # sign of the integer polynomial at the float x = num/den, from
+    # den^n p(num/den) evaluated by Horner in integers
+    num, den = Fraction(x).as_integer_ratio()
+    val = 0
+    scale = 1
+    for c in reversed(coeffs):
+        val = val * num + c * scale
+        scale *= den
+    return (val > 0) - (val < 0)
+
+
+def squarefreeFactors(coeffs, tol=None):
+    # Yun's algorithm, returning monic float factors with their
+    # multiplicities. With a tolerance the gcds are approximate, so a
+    # repeated root that rounding has split in the float coefficients is
+    # still found; without one the factorization is exact, and close but
+    # distinct roots are never merged
+    coeffs = stripZeros(coeffs)
+    if tol is not None:
+        approximate = squarefreeApproximate(coeffs, tol)
+        if approximate is not None:
+            if len(approximate) == 1 and approximate[0][1] == 1:
+                return approximate
+            # repeated roots the coefficients hold exactly are better
+            # factored exactly, when that finds the same structure
+            exact = squarefreeFactors(coeffs)
+            if [(len(a), m) for a, m in exact] == [(len(a), m) for a, m in approximate]:
+                return exact
+            return approximate
+
+    der = [i * c for i, c in enumerate(coeffs)][1:]
+    if len(adaptiveGcd(coeffs, der)) == 1:
+        lead = coeffs[-1]
+        return [([x / lead for x in coeffs], 1)]
+
+    f = [Fraction(x) for x in coeffs]
+    f_der = diffExact(f)
+    common = gcdFraction(f, f_der)
+    b = quotientExact(f, common)
+    c = quotientExact(f_der, common)
+    d = subtractExact(c, diffExact(b))
+
+    factors = []
+    multiplicity = 1
+    while len(b) > 1:
+        a = gcdFraction(b, d)
+        if len(a) > 1:
+            lead = a[-1]
+            factors.append(([float(x / lead) for x in a], multiplicity))
+        b = quotientExact(b, a)
+        c = quotientExact(d, a)
+        d = subtractExact(c, diffExact(b))
+        multiplicity += 1
+
+    return factors
+
+
+def trimSmall(coeffs, tol):
+    # drops leading coefficients that are below tol relative to the largest
+    size = max(abs(x) for x in coeffs)
+    coeffs = list(coeffs)
+    while len(coeffs) > 1 and abs(coeffs[-1]) <= tol * size:
+        del coeffs[-1]
+    return coeffs
+
+
+def approximateGcd(first, second, tol):
+    # float Euclid on unit-sized remainders, a remainder counting as zero
+    # once it is below tol; returns the monic gcd
+    first = stripZeros(first)
+    first_size = max(abs(x) for x in first)
+    if max(abs(x) for x in second) <= tol * first_size:
+        return [x / first[-1] for x in first]
+
+    a = [x / first_size for x in first]
+    b = trimSmall(second, tol)
+    size = max(abs(x) for x in b)
+    b = [x / size for x in b]
+    if len(a) < len(b):
+        a, b = b, a
+    while len(b) > 1:
+        _, rem = divideFloat(a, b)
+        size = max(abs(x) for x in rem)
+        if size <= tol:
+            return [x / b[-1] for x in b]
+        a, b = b, trimSmall([x / size for x in rem], tol)
+    return [1.0]
+
+
+def diffFloat(coeffs):
+    return [i * c for i, c in enumerate(coeffs)][1:] or [0.0]
+
+
+def subtractFloat(first, second):
+    size = max(len(first), len(second))
+    first = first + [0.0] * (size - len(first))
+    second = second + [0.0] * (size - len(second))
+    return [x - y for x, y in zip(first, second)]
+
+
+def squarefreeApproximate(coeffs, tol):
+    # Yun's algorithm with approximateGcd; None when the factor degrees do
+    # not add up, which leaves the input to the exact factorization
+    lead = coeffs[-1]
+    f = [x / lead for x in coeffs]
+    f_der = diffFloat(f)
+    common = approximateGcd(f, f_der, tol)
+    if len(common) == 1:
+        return [(f, 1)]
+
+    b = divideFloat(f, common)[0]
+    c = divideFloat(f_der, common)[0]
+    d = subtractFloat(c, diffFloat(b))
+
+    factors = []
+    multiplicity = 1
+    while len(b) > 1 and multiplicity < len(f):
+        a = approximateGcd(b, d, tol)
+        if len(a) > 1:
+            factors.append((a, multiplicity))
+        b = divideFloat(b, a)[0]
+        c = divideFloat(d, a)[0]
+        d = subtractFloat(c, diffFloat(b))
+        multiplicity += 1
+
+    if sum((len(a) - 1) * m for a, m in factors) != len(f) - 1:
+        return None
+    return factors
+
+
+def adaptiveGcd(first, second):
+    # float Euclid carrying a bound on each remainder's error; the first
+    # remainder whose leading coefficient is not clear of that bound is an
+    # ambiguous zero test, and the gcd is then recomputed exactly
+    first = stripZeros(first)
+    second = stripZeros(second)
+    if len(first) < len(second):
+        first, second = second, first
+    if not any(first):
+        # gcd(0, 0) is the zero polynomial, as in the float Poly.gcd
+        return [0.0]
+    if not any(second):
+        lead = first[-1]
+        return [x / lead for x in first]
+
+    a, b = [float(x) for x in first], [float(x) for x in second]
+    err_a, err_b = 0.0, 0.0
+    while len(b) > 1:
+        quot, rem = divideFloat(a, b)
+        bound = remainderBound(a, quot, b, err_a, err_b)
+        if abs(rem[-1]) <= bound:
+            return exactGcd(first, second)
+        a, b, err_a, err_b = b, rem, err_b, bound
+
+    return [1.0]
@@ -0,0 +1,195 @@
+import numpy as np
+from polynomial import Poly
+
+
+def chebPoints(n, domain=(-1, 1)):
+    # the n + 1 Chebyshev extreme points cos(pi j/n), mapped onto the domain
+    a, b = domain
+    if n == 0:
+        return np.array([(a + b)/2])
+    unit = np.cos(np.pi * np.arange(n + 1) / n)
+    return (b - a)/2 * unit + (a + b)/2
+
+
+def valuesToCoeffs(values):
+    # DCT-I through an FFT of the even extension, O(n log n)
+    values = np.asarray(values, dtype=float)
+    n = len(values) - 1
+    if n == 0:
+        return values.copy()
+
+    extended = np.concatenate([values, values[n-1:0:-1]])
+    coeffs = np.fft.rfft(extended).real[:n + 1] / n
+    coeffs[0] /= 2
+    coeffs[n] /= 2
+    return coeffs
+
+
+def coeffsToValues(coeffs):
+    # inverse of valuesToCoeffs: the series sampled on the chebPoints grid
+    coeffs = np.asarray(coeffs, dtype=float)
+    n = len(coeffs) - 1
+    if n == 0:
+        return coeffs.copy()
+
+    extended = np.concatenate([coeffs, coeffs[n-1:0:-1]])
+    transformed = np.fft.rfft(extended).real[:n + 1]
+    signs = (-1.0)**np.arange(n + 1)
+    return (transformed + coeffs[0] + signs * coeffs[n]) / 2
+
+
+class Cheb:
+
+    significant_figures = 4
+
+    def __new__(cls, coeffs, domain=(-1, 1)):
+        if isinstance(coeffs, (list, tuple)) and isinstance(domain, (list, tuple)):
+            if all(isinstance(x, (int, float)) for x in coeffs) and len(coeffs) > 0:
+                if len(domain) == 2 and domain[0] < domain[1]:
+                    return super().__new__(cls)
+                return "Invalid domain"
+            return "One or more of the coefficients is neither an integer or float. Try again."
+        return "The coefficients or domain form neither a list or tuple. Try again."
+
+    def __init__(self, coeffs, domain=(-1, 1)):
+        coeffs = list(coeffs)
+        while len(coeffs) > 1 and coeffs[-1] == 0:
+            del coeffs[-1]
+
+        self.coeffs = coeffs
+        self.domain = tuple(domain)
+        self.degree = len(coeffs) - 1
+
+    def coeff(self, i):
+        try:
+            return self.coeffs[i]
+        except IndexError:
+            return
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.coeffs}, {self.domain})"
+
+    def __str__(self):
+        terms = [
+            f"{round(c, Cheb.significant_figures)}T_{i}"
+            for i, c in enumerate(self.coeffs) if c
+        ]
+        if not terms:
+            return "The zero polynomial."
+        return " + ".join(terms) + f" on {list(self.domain)}"
+
+    def toUnit(self, x):
+        a, b = self.domain
+        return (2*x - a - b)/(b - a)
+
+    def eval(self, num):
+        # Clenshaw recurrence, vectorized when given a list or array of points
+        if isinstance(num, (list, tuple, np.ndarray)):
+            t = self.toUnit(np.asarray(num, dtype=float))
+            b1 = np.zeros_like(t)
+            b2 = np.zeros_like(t)
+        else:
+            t = self.toUnit(num)
+            b1 = 0
+            b2 = 0
+
+        for c in reversed(self.coeffs[1:]):
+            b1, b2 = c + 2*t*b1 - b2, b1
+
+        return self.coeffs[0] + t*b1 - b2
+
+    def values(self, n=None):
+        # samples on chebPoints(n, domain); n defaults to the degree
+        if n is None:
+            n = self.degree
+        coeffs = np.zeros(n + 1)
+        m = min(n, self.degree) + 1
+        coeffs[:m] = self.coeffs[:m]
+        if n < self.degree:
+            return self.eval(chebPoints(n, self.domain))
+        return coeffsToValues(coeffs)
+
+    @classmethod
+    def fromValues(cls, values, domain=(-1, 1)):
+        return cls(valuesToCoeffs(values).tolist(), domain)
+
+    @classmethod
+    def fromFunction(cls, f, n, domain=(-1, 1)):
+        return cls.fromValues([f(x) for x in chebPoints(n, domain)], domain)
+
+    @classmethod
+    def fromPoly(cls, poly, domain=(-1, 1)):
+        n = max(poly.degree, 1)
+        values = np.polyval(list(reversed(poly.coeffs)), chebPoints(n, domain))
+        coeffs = valuesToCoeffs(values)
+        coeffs[poly.degree + 1:] = 0
+        return cls(coeffs.tolist(), domain)
+
+    def toPoly(self):
+        # monomial coefficients in t by T_{k+1} = 2t T_k - T_{k-1}, then t
+        # is rewritten in terms of x on the domain
+        n = self.degree
+        t_prev = [1] + [0]*n
+        t_curr = [0, 1] + [0]*(n - 1)
+        monomial = [self.coeffs[0] * x for x in t_prev]
+        if n >= 1:
+            monomial = [m + self.coeffs[1] * x for m, x in zip(monomial, t_curr)]
+
+        for k in range(2, n + 1):
+            t_next = [2*t_curr[i-1] - t_prev[i] if i > 0 else -t_prev[0] for i in range(n + 1)]
+            monomial = [m + self.coeffs[k] * x for m, x in zip(monomial, t_next)]
+            t_prev, t_curr = t_curr, t_next
+
+        a, b = self.domain
+        return Poly(monomial).composeWith(Poly([-(a + b)/(b - a), 2/(b - a)]))
+
+    def diff(self):
+        n = self.degree
+        if n == 0:
+            return Cheb([0], self.domain)
+
+        der = [0]*(n + 2)
+        for k in range(n, 0, -1):
+            der[k-1] = der[k+1] + 2*k*self.coeffs[k]
+        der[0] /= 2
+
+        a, b = self.domain
+        return Cheb([d * 2/(b - a) for d in der[:n]], self.domain)
+
+    def intgr(self):
+        # antiderivative vanishing at the left end of the domain
+        n = self.degree
+        coeffs = self.coeffs + [0, 0]
+        integrated = [0]*(n + 2)
+        integrated[1] = coeffs[0] - coeffs[2]/2
+        for k in range(2, n + 2):
+            integrated[k] = (coeffs[k-1] - coeffs[k+1])/(2*k)
+
+        a, b = self.domain
+        integrated = [x * (b - a)/2 for x in integrated]
+        # T_k(-1) = (-1)^k
+        integrated[0] = -sum(x * (-1)**k for k, x in enumerate(integrated))
+        return Cheb(integrated, self.domain)
+
+    def AreaUnder(self, rng):
+        if isinstance(rng, (list, tuple)):
+            if all(isinstance(x, (int, float)) for x in rng):
+                if len(rng) == 2:
+                    first = rng[0]
+                    last = rng[-1]
+                    if first == last:
+                        return 0
+                    if tuple(rng) == self.domain:
+                        # the series integrated exactly term by term: T_k
+                        # over [-1, 1] gives 2/(1 - k^2) for even k, 0 for odd k
+                        a, b = self.domain
+                        total = sum(2*c/(1 - k**2) for k, c in enumerate(self.coeffs) if k % 2 == 0)
+                        return total * (b - a)/2
+                    intgrl = self.intgr()
+                    return intgrl.eval(last) - intgrl.eval(first)
+                else:
+                    return "Invalid range"
+            else:
+                return "Invalid range"
+        else:
+            return "Invalid range"
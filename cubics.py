@@ -1,6 +1,7 @@
 from polynomial import Poly
 from cplxnums import cplx, powFrac, rootsUnity
 from math import sqrt
+from adaptive import certifiedSign, certifiedZero
 
 class Cubic(Poly):
     cube_roots = rootsUnity(3)
@@ -22,18 +23,18 @@ class Cubic(Poly):
         b = coeffs[2]
         a = coeffs[3]
 
-        self.disc = (b**2)*(c**2) - 4*a*(c**3) - 4*(b**3)*d - 27*(a**2)*(d**2) + 18*a*b*c*d
-        
-    def toDepressed(self):
+        self.disc = sum(Cubic.discTerms(a, b, c, d))
 
-        d = self.coeff(0)
-        c = self.coeff(1)
-        b = self.coeff(2)
-        a = self.coeff(3)
-        
-        p = (3*a*c - b**2)/(3*(a**2))
-        q = (2*(b**3) - 9*a*b*c + 27*(a**2)*d)/(27*(a**3))
-        return Cubic([q, p, 0, 1])
+    @staticmethod
+    def discTerms(a, b, c, d):
+        return [(b**2)*(c**2), -4*a*(c**3), -4*(b**3)*d, -27*(a**2)*(d**2), 18*a*b*c*d]
+
+    @staticmethod
+    def tripleTerms(a, b, c, d):
+        return [b**2, -3*a*c]
+
+    def toDepressed(self):
+        return Cubic(Poly.toDepressed(self).coeffs)
 
     def zeroes(self):
         zros = []
@@ -42,8 +43,17 @@ class Cubic(Poly):
         b = self.coeff(2)
         a = self.coeff(3)
         
-        if self.disc == 0:
-            if b**2 == 3 * a * c:
+        if Poly.adaptive:
+            disc_sign = certifiedSign(Cubic.discTerms, [a, b, c, d], 12)
+            disc_zero = disc_sign == 0
+            triple = disc_zero and certifiedZero(Cubic.tripleTerms, [a, b, c, d], 4)
+        else:
+            disc_sign = int(self.disc > 0) - int(self.disc < 0)
+            disc_zero = self.disc == 0
+            triple = b**2 == 3 * a * c
+
+        if disc_zero:
+            if triple:
                 zro = cplx([-b/(3*a), 0])
                 zros += [zro]*3
                 return zros
@@ -62,11 +72,22 @@ class Cubic(Poly):
             del_0 = b**2 - 3*a*c 
             del_1 = 2*(b**3) - 9*a*b*c + 27*(a**2)*d 
 
-            if del_1**2 - 4*(del_0**3) < 0:
-                const_cubed = cplx([del_1/2, 0]) + cplx([0, (1/2)*sqrt(-del_1**2 + 4*(del_0**3))])
+            # del_1^2 - 4 del_0^3 = -27 a^2 disc, so its sign is taken from
+            # the discriminant's rather than from rounded floats. In the real
+            # case the root with the sign of del_1 is taken, which avoids
+            # cancelling to zero when del_0 is zero
+            radical = sqrt(abs(del_1**2 - 4*(del_0**3)))
+            if disc_sign > 0:
+                const_cubed = cplx([del_1/2, 0]) + cplx([0, (1/2)*radical])
+            elif del_1 < 0:
+                const_cubed = cplx([del_1/2, 0]) - cplx([(1/2)*radical, 0])
+            else:
+                const_cubed = cplx([del_1/2, 0]) + cplx([(1/2)*radical, 0])
 
-            if del_1**2 - 4*(del_0**3) > 0:
-                const_cubed = cplx([del_1/2, 0]) + cplx([(1/2)*sqrt(del_1**2 - 4*(del_0**3)), 0])
+            if del_1 == 0 and radical == 0:
+                # a triple root to within rounding
+                zros += [cplx([-b/(3*a), 0])]*3
+                return zros
 
             const = powFrac(const_cubed, 1/3)
             a = cplx([a, 0])
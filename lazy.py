@@ -0,0 +1,369 @@
+from weakref import WeakValueDictionary
+import numpy as np
+from polynomial import Poly
+from rational import Rational
+
+
+def typedKey(value):
+    # 1, 1.0, True and 1+0j are equal but must not share a node, since each
+    # evaluates in its own type
+    if isinstance(value, tuple):
+        return tuple(typedKey(v) for v in value)
+    return (type(value), value)
+
+
+def horner(coeffs, num):
+    val = 0
+    for c in reversed(coeffs):
+        val = val * num + c
+    return val
+
+
+class Lazy:
+    # nodes are hash-consed: building the same operation on the same
+    # operands twice returns the existing node, so shared subexpressions
+    # are stored and evaluated once
+    table = WeakValueDictionary()
+
+    def __new__(cls, op, args=(), value=None):
+        key = (op, tuple(id(arg) for arg in args), typedKey(value))
+        node = Lazy.table.get(key)
+        if node is not None:
+            return node
+
+        node = super().__new__(cls)
+        node.op = op
+        node.args = tuple(args)
+        node.value = value
+        node._order = None
+        node._diff = None
+        node._expanded = None
+        Lazy.table[key] = node
+        return node
+
+    def __init__(self, op, args=(), value=None):
+        pass
+
+    @staticmethod
+    def var():
+        return Lazy("x")
+
+    @staticmethod
+    def const(c):
+        return Lazy("const", value=c)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self})"
+
+    def __str__(self):
+        if self.op == "x":
+            return "x"
+        if self.op == "const":
+            return str(self.value)
+        if self.op == "poly":
+            return f"Poly({list(self.value)})"
+        if self.op == "pow":
+            return f"({self.args[0]})^{self.value}"
+        if self.op == "compose":
+            return f"({self.args[0]})o({self.args[1]})"
+        symbol = {"add": "+", "sub": "-", "mul": "*", "div": "/"}[self.op]
+        return f"({self.args[0]} {symbol} {self.args[1]})"
+
+    def isConst(self, c=None):
+        return self.op == "const" and (c is None or self.value == c)
+
+    def __add__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        if self.isConst() and other.isConst():
+            return Lazy.const(self.value + other.value)
+        if self.isConst(0):
+            return other
+        if other.isConst(0):
+            return self
+        return Lazy("add", (self, other))
+
+    def __radd__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        return other + self
+
+    def __sub__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        if self.isConst() and other.isConst():
+            return Lazy.const(self.value - other.value)
+        if other.isConst(0):
+            return self
+        if self is other:
+            return Lazy.const(0)
+        return Lazy("sub", (self, other))
+
+    def __rsub__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        return other - self
+
+    def __neg__(self):
+        return Lazy.const(0) - self
+
+    def __mul__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        if self.isConst() and other.isConst():
+            return Lazy.const(self.value * other.value)
+        if self.isConst(0) or other.isConst(0):
+            return Lazy.const(0)
+        if self.isConst(1):
+            return other
+        if other.isConst(1):
+            return self
+        return Lazy("mul", (self, other))
+
+    def __rmul__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        return other * self
+
+    def __truediv__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        if other.isConst(1):
+            return self
+        if self.isConst(0) and not other.isConst(0):
+            return Lazy.const(0)
+        return Lazy("div", (self, other))
+
+    def __rtruediv__(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        return other / self
+
+    def __pow__(self, n):
+        if isinstance(n, bool) or not isinstance(n, int):
+            return "Only integer powers of a lazy expression are supported."
+        if n == 0:
+            return Lazy.const(1)
+        if n == 1:
+            return self
+        if self.isConst() and not (n < 0 and self.value == 0):
+            return Lazy.const(self.value**n)
+        return Lazy("pow", (self,), n)
+
+    def composeWith(self, other):
+        other = lazy(other)
+        if isinstance(other, str):
+            return other
+        if self.isConst():
+            return self
+        if other.op == "x":
+            return self
+        return Lazy("compose", (self, other))
+
+    def diff(self):
+        # one pass over the DAG in post-order, so each node's derivative is
+        # built from its operands' derivatives without any recursion
+        for node in self.order():
+            if node._diff is None:
+                node._diff = node._diffNode()
+        return self._diff
+
+    def _diffNode(self):
+        op = self.op
+        if op == "x":
+            return Lazy.const(1)
+        if op == "const":
+            return Lazy.const(0)
+        if op == "poly":
+            return lazy(Poly(list(self.value)).diff())
+        if op == "add":
+            return self.args[0]._diff + self.args[1]._diff
+        if op == "sub":
+            return self.args[0]._diff - self.args[1]._diff
+        if op == "mul":
+            u, v = self.args
+            return u._diff * v + u * v._diff
+        if op == "div":
+            u, v = self.args
+            return (u._diff * v - u * v._diff) / v**2
+        if op == "pow":
+            u = self.args[0]
+            return self.value * u**(self.value - 1) * u._diff
+
+        # the outer function is not in order(), so it is differentiated by
+        # its own pass
+        f, g = self.args
+        return f.diff().composeWith(g) * g._diff
+
+    def Hdiff(self, n):
+        der = self
+        for _ in range(n):
+            der = der.diff()
+        return der
+
+    def order(self):
+        # post-order over the DAG, each shared node listed once; the outer
+        # function of a composition is evaluated at other points, so it is
+        # left out here and evaluated by its own call
+        if self._order is not None:
+            return self._order
+
+        order = []
+        seen = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            stack.append((node, True))
+            children = node.args[1:] if node.op == "compose" else node.args
+            for child in reversed(children):
+                if id(child) not in seen:
+                    stack.append((child, False))
+
+        self._order = order
+        return order
+
+    def eval(self, num):
+        # evaluates the DAG directly at num, a number or a list/array of
+        # points, without expanding any coefficients
+        if isinstance(num, (list, tuple, np.ndarray)):
+            # promoted as in Cheb.eval, so integer points cannot wrap around
+            # in int64 the way the scalar path's Python ints never do
+            points = np.asarray(num)
+            dtype = complex if np.iscomplexobj(points) else float
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return self._evalAt(points.astype(dtype))
+
+        try:
+            return self._evalAt(num)
+        except ZeroDivisionError:
+            return "Undefined"
+
+    def _evalAt(self, num):
+        vals = {}
+        for node in self.order():
+            op = node.op
+            if op == "x":
+                val = num
+            elif op == "const":
+                val = node.value
+            elif op == "poly":
+                val = horner(node.value, num)
+            elif op == "pow":
+                n = node.value
+                val = vals[id(node.args[0])]**n if n > 0 else 1 / vals[id(node.args[0])]**-n
+            elif op == "compose":
+                val = node.args[0]._evalAt(vals[id(node.args[1])])
+            else:
+                u = vals[id(node.args[0])]
+                v = vals[id(node.args[1])]
+                if op == "add":
+                    val = u + v
+                elif op == "sub":
+                    val = u - v
+                elif op == "mul":
+                    val = u * v
+                else:
+                    val = u / v
+            vals[id(node)] = val
+        return vals[id(self)]
+
+    def expand(self):
+        # the expanded Poly, or Rational when a division is involved,
+        # cached on each node of the DAG
+        numer, denom = self._expandPair()
+        if denom is None:
+            return numer
+        return Rational(numer.coeffs, denom.coeffs)
+
+    def _expandPair(self):
+        for node in self.order():
+            if node._expanded is not None:
+                continue
+
+            op = node.op
+            if op == "x":
+                pair = (Poly([0, 1]), None)
+            elif op == "const":
+                pair = (Poly([node.value]), None)
+            elif op == "poly":
+                pair = (Poly(list(node.value)), None)
+            elif op == "pow":
+                numer, denom = node.args[0]._expanded
+                n = node.value
+                if n < 0:
+                    # u^-n is (1/u)^n, so numerator and denominator swap
+                    numer, denom, n = denom if denom is not None else Poly([1]), numer, -n
+                pair = (numer**n, denom**n if denom is not None else None)
+            elif op == "compose":
+                pair = node._expandCompose()
+            else:
+                pair = node._combine(op, *node.args[0]._expanded, *node.args[1]._expanded)
+            node._expanded = pair
+
+        return self._expanded
+
+    def _combine(self, op, n1, d1, n2, d2):
+        if op in ("add", "sub"):
+            if d1 is None and d2 is None:
+                return (n1 + n2 if op == "add" else n1 - n2), None
+            d1 = d1 if d1 is not None else Poly([1])
+            d2 = d2 if d2 is not None else Poly([1])
+            left = n1 * d2
+            right = n2 * d1
+            return (left + right if op == "add" else left - right), d1 * d2
+
+        if op == "mul":
+            if d1 is None and d2 is None:
+                return n1 * n2, None
+            d1 = d1 if d1 is not None else Poly([1])
+            d2 = d2 if d2 is not None else Poly([1])
+            return n1 * n2, d1 * d2
+
+        d1 = d1 if d1 is not None else Poly([1])
+        d2 = d2 if d2 is not None else Poly([1])
+        return n1 * d2, d1 * n2
+
+    def _expandCompose(self):
+        f, g = self.args
+        fn, fd = f._expandPair()
+        gn, gd = g._expanded
+
+        if fd is None and gd is None:
+            return fn.composeWith(gn), None
+
+        gd = gd if gd is not None else Poly([1])
+        fd = fd if fd is not None else Poly([1])
+        composite = Rational(list(fn.coeffs), list(fd.coeffs)).composeWith(
+            Rational(list(gn.coeffs), list(gd.coeffs))
+        )
+        return Poly(composite.numerator), Poly(composite.denominator)
+
+
+def lazy(obj):
+    if isinstance(obj, Lazy):
+        return obj
+    if isinstance(obj, Rational):
+        return lazy(Poly(list(obj.numerator))) / lazy(Poly(list(obj.denominator)))
+    if isinstance(obj, Poly):
+        if obj.degree == 0:
+            return Lazy.const(obj.coeff(0))
+        if obj.degree == 1 and obj.coeffs[0] == 0 and obj.coeffs[1] == 1:
+            return Lazy.var()
+        return Lazy("poly", value=tuple(obj.coeffs))
+    if isinstance(obj, (int, float, complex)):
+        return Lazy.const(obj)
+    return "Cannot form a lazy expression from this type."
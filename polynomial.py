@@ -1,10 +1,111 @@
 from collections import defaultdict
+from fractions import Fraction
+from math import inf
 import numpy as np
 import cplxnums as cplx
+from adaptive import filteredDet, adaptiveGcd, divideFloat, remainderBound, signExact, squarefreeFactors, sturmChainExact, sturmChainIntegers
+
+def fftMultiply(first, second):
+    size = len(first) + len(second) - 1
+    n = 1
+    while n < size:
+        n *= 2
+    prod = np.fft.irfft(np.fft.rfft(first, n) * np.fft.rfft(second, n), n)
+    return prod[:size]
+
+def taylorShift(coeffs, a):
+    # coefficients of p(x + a) by repeated synthetic division, O(n^2) and
+    # exact whenever the coefficients and a are exact
+    coeffs = list(coeffs)
+    n = len(coeffs)
+    for i in range(n - 1):
+        for j in range(n - 2, i - 1, -1):
+            coeffs[j] += a * coeffs[j+1]
+    return coeffs
+
+def taylorShiftFast(coeffs, a, cutoff, binomials=None):
+    # divide and conquer: p(x + a) = low(x + a) + (x + a)^m high(x + a),
+    # with the products done by FFT convolution for O(n log^2 n) overall
+    n = len(coeffs)
+    if n <= cutoff:
+        return np.array(taylorShift(coeffs, a), dtype=float)
+
+    if binomials is None:
+        binomials = {}
+    m = n // 2
+    if m not in binomials:
+        # (x + a)^m from the top coefficient down, in floats throughout:
+        # comb(m, k) as an int overflows the float range for m above ~1030
+        row = np.zeros(m + 1)
+        row[m] = 1.0
+        for k in range(m, 0, -1):
+            row[k-1] = row[k] * a * k / (m - k + 1)
+        binomials[m] = row
+
+    low = taylorShiftFast(coeffs[:m], a, cutoff, binomials)
+    high = taylorShiftFast(coeffs[m:], a, cutoff, binomials)
+
+    shifted = fftMultiply(high, binomials[m])
+    shifted[:m] += low
+    return shifted[:n]
+
+def descartesTransform(coeffs, a, b):
+    # coefficients of (1 + x)^n p((a + bx)/(1 + x)); exact when given
+    # Fractions
+    mapped = taylorShift(coeffs, a)
+    mapped = [c * (b - a)**i for i, c in enumerate(mapped)]
+    return taylorShift(list(reversed(mapped)), 1)
+
+def descartesErrorBound(coeffs, a, b):
+    # the same transform run on absolute values bounds the magnitudes that
+    # meet in each coefficient, and so the rounding error of each stage
+    gamma = 4 * len(coeffs) * np.finfo(float).eps
+    mapped = taylorShift([abs(c) for c in coeffs], abs(a))
+    err = [gamma * x for x in mapped]
+    mapped = [x * abs(b - a)**i for i, x in enumerate(mapped)]
+    err = [x * abs(b - a)**i * (1 + gamma) for i, x in enumerate(err)]
+    mapped = list(reversed(mapped))
+    err = list(reversed(err))
+    shifted = taylorShift(mapped, 1)
+    return [gamma * s + e for s, e in zip(shifted, taylorShift(err, 1))]
+
+def hornerExact(coeffs, x):
+    val = Fraction(0)
+    for c in reversed(coeffs):
+        val = val * x + c
+    return val
+
+def signVariations(rows):
+    # sign changes down each column of rows, skipping zeros
+    count = np.zeros(np.shape(rows)[-1], dtype=int)
+    last = np.zeros(np.shape(rows)[-1])
+    for row in rows:
+        signs = np.sign(row)
+        count += (signs != 0) & (last != 0) & (signs != last)
+        last = np.where(signs != 0, signs, last)
+    return count
+
+def asIntervals(rng):
+    if rng is None:
+        return [(-inf, inf)], True
+    if isinstance(rng, (list, tuple)):
+        if len(rng) == 2 and all(isinstance(x, (int, float)) for x in rng):
+            return [tuple(rng)], True
+        if all(isinstance(pair, (list, tuple)) and len(pair) == 2 for pair in rng):
+            if all(isinstance(x, (int, float)) for pair in rng for x in pair):
+                return [tuple(pair) for pair in rng], False
+    return None, False
 
 class Poly:
 
     significant_figures = 4
+    # relative size below which squarefree treats a float remainder as
+    # zero; roots closer than about its square root count as one
+    squarefree_tolerance = 1e-8
+    # the FFT Taylor shift is only accurate normwise: small coefficients
+    # can lose all their digits, so it is used only when a cutoff is set
+    shift_cutoff = None
+    adaptive = False
 
     def __new__(cls, coeffs):
         if isinstance(coeffs, (list, tuple)):
@@ -234,7 +335,34 @@ class Poly:
         else:
             return "Invalid range"
     
+    def shift(self, a):
+        coeffs = list(self.coeffs)
+        cutoff = Poly.shift_cutoff
+        if cutoff is None or all(isinstance(x, int) for x in coeffs + [a]) or len(coeffs) <= cutoff:
+            return Poly(taylorShift(coeffs, a))
+
+        return Poly(taylorShiftFast(coeffs, a, cutoff).tolist())
+
+    def scale(self, c):
+        return Poly([coeff * c**i for i, coeff in enumerate(self.coeffs)])
+
+    def toDepressed(self):
+        n = self.degree
+        if n == 0:
+            return Poly(list(self.coeffs))
+
+        lead = self.coeff(n)
+        shifted = self.shift(-self.coeff(n-1)/(n*lead))
+
+        depressed = [coeff/lead for coeff in shifted.coeffs]
+        depressed[n-1] = 0
+        depressed[n] = 1
+        return Poly(depressed)
+
     def composeWith(self, other):
+        if other.degree == 1:
+            return self.shift(other.coeff(0)).scale(other.coeff(1))
+
         curr_pol = Poly([0])
         for i in range(self.degree + 1):
             curr_pol += Poly([self.coeff(i)]) * (other**i)
@@ -262,6 +390,8 @@ class Poly:
     def resultant(self, other):
         #significant_figures = 4
         mtrx = Poly.SylvesterMatrix(self, other)
+        if Poly.adaptive:
+            return filteredDet(mtrx)
         mtrx = np.array([mtrx])
         return np.linalg.det(mtrx)[0]
 
@@ -271,6 +401,8 @@ class Poly:
         mult_factor_sign = (-1)**(self.degree * (self.degree - 1)/2)
         mult_factor_coeff = 1/self.coeff(self.degree)
 
+        if Poly.adaptive:
+            return mult_factor_sign * mult_factor_coeff * resultant
         return round(mult_factor_sign * mult_factor_coeff * resultant, Poly.significant_figures)
 
     def cplxEval(self, arg):
@@ -285,6 +417,9 @@ class Poly:
             return self.eval(arg)
 
     def gcd(self, other):
+        if Poly.adaptive:
+            return Poly(adaptiveGcd(self.coeffs, other.coeffs))
+
         gcd = Poly([1])
         
         if self.degree >= other.degree:
@@ -323,3 +458,213 @@ class Poly:
             return other.gcd(self)
                 
 
+    def sturmChain(self):
+        key = tuple(self.coeffs)
+        cached = getattr(self, "_sturm", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # float remainders are used while their leading coefficient is clear
+        # of its error bound; a remainder that might vanish decides the
+        # chain's length and repeated roots, so the whole chain is then
+        # rebuilt exactly over the integers. errs holds a bound on the
+        # error in each member's coefficients
+        eps = np.finfo(float).eps
+        coeffs = [float(x) for x in self.coeffs]
+        chain = [Poly(coeffs)]
+        errs = [0.0 if all(x == y for x, y in zip(coeffs, self.coeffs)) else eps * max(abs(x) for x in coeffs)]
+        if self.degree > 0:
+            der = [i * c for i, c in enumerate(coeffs)][1:]
+            chain.append(Poly(der))
+            errs.append(self.degree * errs[0] + eps * max(abs(x) for x in der))
+        while chain[-1].degree > 0:
+            quot, remainder = divideFloat(chain[-2].coeffs, chain[-1].coeffs)
+            bound = remainderBound(chain[-2].coeffs, quot, chain[-1].coeffs, errs[-2], errs[-1])
+            if abs(remainder[-1]) <= bound:
+                chain = [Poly(member) for member in sturmChainExact(self.coeffs)]
+                errs = [eps * max(abs(x) for x in member.coeffs) for member in chain]
+                break
+            size = max(abs(x) for x in remainder)
+            chain.append(Poly([-x/size for x in remainder]))
+            errs.append(bound/size)
+
+        self._sturm = (key, chain, errs)
+        return chain
+
+    def sturmChainIntegers(self):
+        key = tuple(self.coeffs)
+        cached = getattr(self, "_sturm_integers", None)
+        if cached is None or cached[0] != key:
+            cached = (key, sturmChainIntegers(self.coeffs))
+            self._sturm_integers = cached
+        return cached[1]
+
+    def sturmVariations(self, points):
+        # each member is evaluated in floats with a bound on its error from
+        # the coefficients and from Horner's rounding; a point where any
+        # sign is within its bound is counted again on the exact chain
+        chain = self.sturmChain()
+        errs = self._sturm[2]
+        points = np.asarray(points, dtype=float)
+        finite = np.isfinite(points)
+        at = np.where(finite, points, 0)
+        ambiguous = np.zeros(len(points), dtype=bool)
+        rows = []
+        for member, err in zip(chain, errs):
+            coeffs = list(reversed(member.coeffs))
+            vals = np.polyval(coeffs, at)
+            size = np.polyval(np.abs(coeffs), np.abs(at))
+            bound = 2 * len(coeffs) * np.finfo(float).eps * size + err * np.polyval(np.ones(len(coeffs)), np.abs(at))
+            ambiguous |= finite & ~(np.abs(vals) > bound)
+            lead = member.coeff(member.degree)
+            at_inf = np.where(points > 0, lead, lead * (-1)**member.degree)
+            rows.append(np.where(finite, vals, at_inf))
+
+        variations = signVariations(rows)
+        for j in np.flatnonzero(ambiguous):
+            signs = [signExact(member, float(points[j])) for member in self.sturmChainIntegers()]
+            variations[j] = signVariations([[s] for s in signs])[0]
+        return variations
+
+    def rootBound(self):
+        lead = abs(self.coeff(self.degree))
+        return 1 + max(abs(self.coeff(i))/lead for i in range(self.degree))
+
+    def countRealRoots(self, rng=None):
+        intervals, single = asIntervals(rng)
+        if intervals is None:
+            return "Invalid range"
+        if self.degree == 0:
+            counts = [0] * len(intervals)
+            return counts[0] if single else counts
+
+        ends = [x for pair in intervals for x in pair]
+        variations = self.sturmVariations(ends)
+        # a reversed interval (a, b] with b < a holds no points
+        counts = [
+            int(variations[2*i] - variations[2*i + 1]) if a < b else 0
+            for i, (a, b) in enumerate(intervals)
+        ]
+        return counts[0] if single else counts
+
+    def isolateRealRoots(self, rng=None, method="sturm", max_depth=60):
+        # the roots in each query interval (a, b] come back, whichever the
+        # method, as open intervals (c, d) holding one root each, or as
+        # (r, r) for a root r found exactly at an end or a split point
+        intervals, single = asIntervals(rng)
+        if intervals is None:
+            return "Invalid range"
+        if method not in ("sturm", "descartes"):
+            return "Unknown method. Use 'sturm' or 'descartes'."
+
+        isolated = [[] for _ in intervals]
+        if self.degree == 0:
+            return isolated[0] if single else isolated
+
+        bound = self.rootBound()
+        clamped = [(max(a, -bound), min(b, bound)) for a, b in intervals]
+
+        if method == "sturm":
+            self._sturmIsolate(clamped, isolated, max_depth)
+        else:
+            # the first member of the Sturm chain has had any repeated
+            # factor divided out, so both methods make the same call on
+            # which roots are repeated
+            squarefree = self.sturmChain()[0]
+            for i, (a, b) in enumerate(clamped):
+                if a < b:
+                    isolated[i] = squarefree._descartesIsolate(a, b, max_depth)
+                if a < b and self.isRootAt(b):
+                    isolated[i].append((b, b))
+
+        return isolated[0] if single else isolated
+
+    def _sturmIsolate(self, intervals, isolated, max_depth):
+        # bisects every query interval level by level, so each level costs
+        # one vectorized evaluation of the chain at all of the new midpoints
+        ends = [x for pair in intervals for x in pair]
+        variations = self.sturmVariations(ends)
+        frontier = [
+            (i, a, b, variations[2*i], variations[2*i + 1])
+            for i, (a, b) in enumerate(intervals) if a < b
+        ]
+
+        depth = 0
+        while frontier:
+            splitting = []
+            for i, a, b, va, vb in frontier:
+                count = va - vb
+                if count == 1 or (count > 1 and depth >= max_depth):
+                    # (a, b] is half-open, so a root at b is split off
+                    if self.isRootAt(b):
+                        if count > 1:
+                            isolated[i].append((a, b))
+                        isolated[i].append((b, b))
+                    else:
+                        isolated[i].append((a, b))
+                elif count > 1:
+                    splitting.append((i, a, b, va, vb))
+
+            if not splitting:
+                break
+
+            mids = [(a + b)/2 for _, a, b, _, _ in splitting]
+            mid_variations = self.sturmVariations(mids)
+            frontier = []
+            for (i, a, b, va, vb), m, vm in zip(splitting, mids, mid_variations):
+                frontier.append((i, a, m, va, vm))
+                frontier.append((i, m, b, vm, vb))
+            depth += 1
+
+        for found in isolated:
+            found.sort()
+
+    def isRootAt(self, x):
+        return hornerExact([Fraction(c) for c in self.coeffs], Fraction(x)) == 0
+
+    def descartesBound(self, a, b):
+        # sign variations of (1 + x)^n p((a + bx)/(1 + x)), an upper bound on
+        # the roots in (a, b) that is exact when it is 0 or 1; when a float
+        # coefficient is within its error bound its sign is settled in
+        # Fractions instead
+        coeffs = [float(x) for x in self.coeffs]
+        transformed = descartesTransform(coeffs, a, b)
+        bounds = descartesErrorBound(coeffs, a, b)
+        if any(abs(x) <= bound for x, bound in zip(transformed, bounds)):
+            exact = [Fraction(x) for x in self.coeffs]
+            transformed = descartesTransform(exact, Fraction(a), Fraction(b))
+        return int(signVariations([[int(x > 0) - int(x < 0)] for x in transformed])[0])
+
+    def _descartesIsolate(self, a, b, max_depth):
+        variations = self.descartesBound(a, b)
+        if variations == 0:
+            return []
+        if variations == 1 or max_depth == 0:
+            return [(a, b)]
+
+        # the open halves miss a root on the split point, so it is checked
+        # exactly on its own
+        m = (a + b)/2
+        isolated = self._descartesIsolate(a, m, max_depth - 1)
+        if self.isRootAt(m):
+            isolated.append((m, m))
+        return isolated + self._descartesIsolate(m, b, max_depth - 1)
+
+    def monic(self):
+        lead = self.coeff(self.degree)
+        return Poly([coeff/lead for coeff in self.coeffs])
+
+    def squarefree(self, exact=False):
+        # monic factors with their multiplicities, self being coeff(degree)
+        # times the product of factor**multiplicity; repeated roots are
+        # found within Poly.squarefree_tolerance unless exact is set
+        if self.degree == 0:
+            return []
+        tol = None if exact else Poly.squarefree_tolerance
+        return [(Poly(factor), multiplicity) for factor, multiplicity in squarefreeFactors(self.coeffs, tol)]
+
+    def squarefreePart(self, exact=False):
+        part = Poly([1])
+        for factor, _ in self.squarefree(exact):
+            part *= factor
+        return part
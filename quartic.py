@@ -3,6 +3,7 @@ from cplxnums import cplx, powFrac
 from math import sqrt
 from quadratics import Quadratic
 from cubics import Cubic
+from adaptive import certifiedZero
 
 class Quartic(Poly):
     significant_figures = 4
@@ -19,17 +20,12 @@ class Quartic(Poly):
         super().__init__(coeffs)
 
     def toDepressed(self):
-        e = self.coeff(0)
-        d = self.coeff(1)
-        c = self.coeff(2)
-        b = self.coeff(3)
-        a = self.coeff(4)
+        return Quartic(Poly.toDepressed(self).coeffs)
 
-        alpha = -3*(b**2)/(8*(a**2)) + c/a 
-        beta = (b**3)/(8*(a**3)) - (b*c)/(2*(a**2)) + d/a 
-        gamma = (-3*(b**4))/(256*(a**4)) + (c*(b**2))/(16*(a**3)) - (b*d)/(4*(a**2)) + e/a 
-
-        return Quartic([gamma, beta, alpha, 0, 1])
+    @staticmethod
+    def depressedLinearTerms(a, b, c, d):
+        # the x coefficient of the depressed quartic times 8a^3
+        return [b**3, -4*a*b*c, 8*(a**2)*d]
 
     def zeroesBiQuad(self):
         if self.coeff(1) == 0 and self.coeff(3) == 0:
@@ -59,7 +55,12 @@ class Quartic(Poly):
     def zeroes(self):
 
         depressed = self.toDepressed()
-        if round(depressed.coeff(1), Quartic.significant_figures) == 0:
+        if Poly.adaptive:
+            coeffs = [self.coeff(4), self.coeff(3), self.coeff(2), self.coeff(1)]
+            biquadratic = certifiedZero(Quartic.depressedLinearTerms, coeffs, 8)
+        else:
+            biquadratic = round(depressed.coeff(1), Quartic.significant_figures) == 0
+        if biquadratic:
             return self.zeroesBiQuad()
 
         depr_coeffs = depressed.coeffs 
@@ -0,0 +1,391 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from polynomial import Poly
+from rational import Rational
+from cplxnums import cplx
+from zeroes import solveZeroes
+
+
+def hornerBatch(coeff_lists, points):
+    # evaluates coeff_lists[i] at points[i] for every i in one vectorized pass
+    # by padding the coefficients into a matrix and running Horner over its columns
+    dtype = complex if any(isinstance(x, complex) for x in points) else float
+    width = max(len(coeffs) for coeffs in coeff_lists)
+
+    mtrx = np.zeros((len(coeff_lists), width), dtype=dtype)
+    for i, coeffs in enumerate(coeff_lists):
+        mtrx[i, :len(coeffs)] = coeffs
+
+    pts = np.array(points, dtype=dtype)
+    vals = np.zeros(len(points), dtype=dtype)
+    for j in reversed(range(width)):
+        vals = vals * pts + mtrx[:, j]
+
+    return vals
+
+
+def realIfReal(val, point):
+    # a batch holding any complex point is evaluated in complex arithmetic,
+    # so hand real points back the real type they would get from Poly.eval
+    if isinstance(val, complex) and not isinstance(point, complex):
+        return val.real
+    return val
+
+
+def isIntegral(coeff_lists, point):
+    # int-only requests can exceed a float's range or precision, so they
+    # are left to the exact Python-int evaluation instead of hornerBatch
+    values = [point] + [c for coeffs in coeff_lists for c in coeffs]
+    return all(isinstance(x, int) and not isinstance(x, bool) for x in values)
+
+
+def checkRequest(obj, cls, num=0):
+    # rejects a bad request before it is queued, so it cannot fail the
+    # vectorized pass for the other requests batched with it
+    if not isinstance(obj, cls):
+        raise TypeError(obj if isinstance(obj, str) else f"Expected a {cls.__name__}, got {type(obj).__name__}")
+    if isinstance(num, bool) or not isinstance(num, (int, float, complex)):
+        raise TypeError(f"Cannot evaluate at a point of type {type(num).__name__}")
+
+
+def evalEach(evaluate, indices, results):
+    # vectorized first; if that fails, each request on its own so that
+    # an error only reaches the request that caused it
+    try:
+        for i, val in zip(indices, evaluate(indices)):
+            results[i] = (True, val)
+    except Exception:
+        for i in indices:
+            try:
+                results[i] = (True, evaluate([i])[0])
+            except Exception as exc:
+                results[i] = (False, exc)
+
+
+class BatchService:
+
+    def __init__(self, max_batch=256, max_latency=0.002, executor=None):
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.executor = executor
+        self.owns_executor = False
+        self.queue = None
+        self.collector = None
+
+        self.requests = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.max_queue_depth = 0
+
+    async def start(self):
+        if self.collector is not None:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+            self.owns_executor = True
+        self.queue = asyncio.Queue()
+        self.collector = asyncio.create_task(self._collect())
+
+    async def stop(self):
+        if self.collector is None:
+            return
+        await self.queue.put(None)
+        await self.collector
+        self.collector = None
+        if self.owns_executor:
+            self.executor.shutdown()
+            self.executor = None
+            self.owns_executor = False
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _submit(self, kind, obj, arg=None):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((kind, obj, arg, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def evalPoly(self, poly, num):
+        if isinstance(poly, (list, tuple)):
+            poly = Poly(list(poly))
+        checkRequest(poly, Poly, num)
+        return await self._submit("poly", poly, num)
+
+    async def evalRational(self, rational, num):
+        checkRequest(rational, Rational, num)
+        return await self._submit("rational", rational, num)
+
+    async def zeroes(self, poly):
+        if isinstance(poly, (list, tuple)):
+            poly = Poly(list(poly))
+        checkRequest(poly, Poly)
+        return await self._submit("zeroes", poly)
+
+    def metrics(self):
+        mean_batch_size = self.requests/self.batches if self.batches else 0
+        return {
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "mean_batch_size": mean_batch_size,
+        }
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self.requests += len(batch)
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+
+            results = await loop.run_in_executor(self.executor, self._runBatch, batch)
+            for (_, _, _, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _runBatch(self, batch):
+        results = [None] * len(batch)
+
+        def evalPolys(indices):
+            vals = hornerBatch(
+                [batch[i][1].coeffs for i in indices],
+                [batch[i][2] for i in indices]
+            )
+            return [realIfReal(val, batch[i][2]) for i, val in zip(indices, vals.tolist())]
+
+        def evalRationals(indices):
+            points = [batch[i][2] for i in indices]
+            numer_vals = hornerBatch([batch[i][1].numerator for i in indices], points)
+            denom_vals = hornerBatch([batch[i][1].denominator for i in indices], points)
+            return [
+                realIfReal(numer/denom, batch[i][2]) if denom != 0 else "Undefined"
+                for i, numer, denom in zip(indices, numer_vals.tolist(), denom_vals.tolist())
+            ]
+
+        def evalExact(indices):
+            return [batch[i][1].eval(batch[i][2]) for i in indices]
+
+        def integral(i):
+            kind, obj, num, _ = batch[i]
+            if kind == "poly":
+                return isIntegral([obj.coeffs], num)
+            return isIntegral([obj.numerator, obj.denominator], num)
+
+        for kind, evaluate in (("poly", evalPolys), ("rational", evalRationals)):
+            indices = [i for i, item in enumerate(batch) if item[0] == kind]
+            exact_idx = [i for i in indices if integral(i)]
+            float_idx = [i for i in indices if not integral(i)]
+            if exact_idx:
+                evalEach(evalExact, exact_idx, results)
+            if float_idx:
+                evalEach(evaluate, float_idx, results)
+
+        for i, (kind, obj, _, _) in enumerate(batch):
+            if kind == "zeroes":
+                try:
+                    results[i] = (True, solveZeroes(obj))
+                except Exception as exc:
+                    results[i] = (False, exc)
+
+        return results
+
+
+def toWire(val):
+    if isinstance(val, cplx):
+        return {"re": float(val.re), "im": float(val.im)}
+    if isinstance(val, complex):
+        return {"re": val.real, "im": val.imag}
+    if isinstance(val, (list, tuple)):
+        return [toWire(x) for x in val]
+    if isinstance(val, dict):
+        return {key: toWire(val[key]) for key in val}
+    if isinstance(val, (str, int, float)):
+        return val
+    return float(val)
+
+
+def fromWire(val):
+    if isinstance(val, dict) and set(val) == {"re", "im"}:
+        return cplx([val["re"], val["im"]])
+    if isinstance(val, list):
+        return [fromWire(x) for x in val]
+    return val
+
+
+class PolyServer:
+    # local line-delimited JSON front end over a BatchService, used as an
+    # in-process stand-in for the production service
+
+    def __init__(self, service=None, host="127.0.0.1", port=0):
+        self.service = service if service is not None else BatchService()
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        await self.service.start()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.host, self.port
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _handle(self, reader, writer):
+        lock = asyncio.Lock()
+        pending = set()
+
+        async def respond(request):
+            try:
+                result = await self._dispatch(request)
+                response = {"id": request.get("id"), "result": toWire(result)}
+            except Exception as exc:
+                response = {"id": request.get("id"), "error": str(exc)}
+            async with lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(respond(json.loads(line)))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request):
+        op = request["op"]
+        if op == "eval":
+            return await self.service.evalPoly(request["coeffs"], self._point(request["x"]))
+        if op == "rational":
+            rational = Rational(request["numerator"], request["denominator"])
+            return await self.service.evalRational(rational, self._point(request["x"]))
+        if op == "zeroes":
+            return await self.service.zeroes(request["coeffs"])
+        if op == "metrics":
+            return self.service.metrics()
+        raise ValueError(f"Unknown operation {op}")
+
+    def _point(self, x):
+        if isinstance(x, dict):
+            return complex(x["re"], x["im"])
+        return x
+
+
+class PolyClient:
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.listener = None
+        self.waiting = {}
+        self.next_id = 0
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.listener
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _listen(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self.waiting.pop(response["id"], None)
+            if future is None or future.done():
+                continue
+            if "error" in response:
+                future.set_exception(RuntimeError(response["error"]))
+            else:
+                future.set_result(response["result"])
+
+        for future in self.waiting.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection closed"))
+        self.waiting.clear()
+
+    async def _call(self, request):
+        self.next_id += 1
+        request["id"] = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[self.next_id] = future
+        self.writer.write((json.dumps(request) + "\n").encode())
+        await self.writer.drain()
+        return await future
+
+    async def evalPoly(self, coeffs, num):
+        return fromWire(await self._call({"op": "eval", "coeffs": list(coeffs), "x": toWire(num)}))
+
+    async def evalRational(self, numerator, denominator, num):
+        request = {"op": "rational", "numerator": list(numerator), "denominator": list(denominator), "x": toWire(num)}
+        return fromWire(await self._call(request))
+
+    async def zeroes(self, coeffs):
+        return fromWire(await self._call({"op": "zeroes", "coeffs": list(coeffs)}))
+
+    async def metrics(self):
+        return await self._call({"op": "metrics"})
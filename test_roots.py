@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from polynomial import Poly
+from zeroes import zeroesWithMultiplicity
+
+
+def fromRoots(roots):
+    p = Poly([1.0])
+    for r in roots:
+        p = p * Poly([-r, 1.0])
+    return p
+
+
+def holds(interval, root):
+    # open intervals, with a root found exactly given as (r, r)
+    a, b = interval
+    return a < root < b or a == b == root
+
+
+def test_cluster_count_not_negative():
+    p = fromRoots([-0.834287]*4 + [-0.834284, -4.761, -1.775])
+    assert p.countRealRoots((-0.834297, -0.834277)) == 0
+    assert p.isolateRealRoots((-0.834297, -0.834277), method="descartes") == []
+
+
+@pytest.mark.parametrize("method", ["sturm", "descartes"])
+def test_cluster_isolation_finds_distinct_roots(method):
+    p = fromRoots([2.550696]*3 + [2.550697, -0.8, 3.0, 4.75, 3.335808, -3.478878])
+    isolated = p.isolateRealRoots(method=method)
+    assert len(isolated) == 7
+    assert all(p.countRealRoots(interval) == 1 for interval in isolated if interval[0] < interval[1])
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_dyadic_clusters(seed):
+    # integer roots, some repeated, and a cluster 2^-10 apart around one of
+    # them: few enough bits that the expanded coefficients are exact, so
+    # the distinct roots are known
+    rng = np.random.default_rng(seed)
+    centres = [float(c) for c in rng.choice(np.arange(-4, 5), 3, replace=False)]
+    roots = [c for c in centres for _ in range(int(rng.integers(1, 3)))]
+    roots += [centres[0] + k / 1024 for k in range(1, int(rng.integers(2, 4)))]
+    distinct = sorted(set(roots))
+    p = fromRoots(roots)
+
+    assert p.countRealRoots() == len(distinct)
+    for method in ("sturm", "descartes"):
+        isolated = p.isolateRealRoots(method=method)
+        assert len(isolated) == len(distinct)
+        for interval in isolated:
+            assert sum(holds(interval, r) for r in distinct) == 1
+
+
+def test_counts_on_subintervals():
+    p = fromRoots([1.0, 1.0, 1.0 + 2**-20, 1.0 + 2**-19, -2.0])
+    ends = np.linspace(0.999999, 1.000003, 9)
+    for a, b in zip(ends[:-1], ends[1:]):
+        expected = sum(a < r <= b for r in (1.0, 1.0 + 2**-20, 1.0 + 2**-19))
+        assert p.countRealRoots((a, b)) == expected
+
+
+def test_reversed_interval_is_empty():
+    p = fromRoots([1.0, 2.0, 3.0])
+    assert p.countRealRoots((3, 1)) == 0
+    assert p.countRealRoots([(3, 1), (1, 3)]) == [0, 2]
+    assert p.isolateRealRoots((3, 1)) == []
+    assert p.isolateRealRoots((3, 1), method="descartes") == []
+
+
+def test_methods_share_interval_convention():
+    p = fromRoots([2.0, 3.0])
+    assert p.isolateRealRoots((1, 3)) == [(2.0, 2.0), (3, 3)]
+    assert p.isolateRealRoots((1, 3), method="descartes") == [(1, 3), (3, 3)]
+    for method in ("sturm", "descartes"):
+        assert p.isolateRealRoots((2, 3), method=method) == [(3, 3)]
+
+
+@pytest.mark.parametrize("roots, expected", [
+    ([0.1, 0.1, 0.3], [(0.1, 2), (0.3, 1)]),
+    ([1/3, 1/3, 2], [(1/3, 2), (2, 1)]),
+    ([1, 1, 1, 2, 2, 5], [(1, 3), (2, 2), (5, 1)]),
+    ([1, 1.001, 3], [(1, 1), (1.001, 1), (3, 1)]),
+])
+def test_multiplicities_of_float_data(roots, expected):
+    zros = sorted((float(getattr(z, "re", z)), m) for z, m in zeroesWithMultiplicity(fromRoots(roots)))
+    assert [m for _, m in zros] == [m for _, m in expected]
+    assert np.allclose([z for z, _ in zros], [z for z, _ in expected], atol=1e-9)
+
+
+def test_exact_squarefree_keeps_rounded_roots_apart():
+    p = fromRoots([0.1, 0.1, 0.3])
+    assert [m for _, m in p.squarefree(exact=True)] == [1]
+    assert sorted(m for _, m in p.squarefree()) == [1, 2]
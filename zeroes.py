@@ -0,0 +1,42 @@
+import numpy as np
+from polynomial import Poly
+from cplxnums import cplx
+from quadratics import Quadratic
+from cubics import Cubic
+from quartic import Quartic
+
+
+def solveZeroes(poly):
+    coeffs = list(poly.coeffs)
+    degree = poly.degree
+
+    if degree == 0:
+        return []
+    if degree == 1:
+        return [-coeffs[0]/coeffs[1]]
+    if degree == 2:
+        return list(Quadratic(coeffs).zeroes())
+    if degree == 3:
+        return list(Cubic(coeffs).zeroes())
+    if degree == 4:
+        return list(Quartic(coeffs).zeroes())
+
+    zros = []
+    for zro in np.roots(list(reversed(coeffs))):
+        if zro.imag == 0:
+            zros += [float(zro.real)]
+        else:
+            zros += [cplx([float(zro.real), float(zro.imag)])]
+    return zros
+
+
+def zeroesWithMultiplicity(poly, exact=False):
+    # solves each square-free factor on its own, so no solver ever sees a
+    # repeated root, and pairs each zero with the multiplicity of its factor
+    if isinstance(poly, (list, tuple)):
+        poly = Poly(list(poly))
+
+    zros = []
+    for factor, multiplicity in poly.squarefree(exact):
+        zros += [(zro, multiplicity) for zro in solveZeroes(factor)]
+    return zros